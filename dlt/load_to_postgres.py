@@ -1,14 +1,32 @@
 import os
 import logging
 import pandas as pd
+import numpy as np
 import psycopg2
 import psycopg2.extras
-import gzip
-import shutil
-import json
+import psycopg2.pool
+import orjson
 import ast
-from io import StringIO
+import re
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import io
+import shutil
+import struct
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
 from dotenv import load_dotenv
+from google.cloud import storage
+
+try:
+    from isal import igzip as gzip
+    HAS_ISAL = True
+except ImportError:
+    import gzip
+    HAS_ISAL = False
 
 # Load environment variables
 env_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), ".env")
@@ -25,44 +43,123 @@ DB_PARAMS = {
     "password": os.getenv("CLOUD_DB_PASSWORD") if USE_CLOUD_DB else os.getenv("DB_PASSWORD")
 }
 
+# Determine whether to switch the staging table to LOGGED (crash-safe) once it is loaded
+DURABLE_STAGING = os.getenv("DURABLE_STAGING", "False").strip().lower() == "true"
+
+# Session settings for the bulk load: commits return before WAL is flushed, notices are silenced
+LOAD_SESSION_SQL = "SET LOCAL synchronous_commit = off; SET LOCAL client_min_messages = warning;"
+
 # Local storage configuration
 LOCAL_STORAGE = os.getenv("LOCAL_STORAGE", "downloaded_data")
 
+# Determine whether to stream the CSV files from GCS instead of LOCAL_STORAGE
+USE_GCS = os.getenv("USE_GCS", "False").strip().lower() == "true"
+GCS_BUCKET = os.getenv("GCS_BUCKET")
+GCS_CSV_PATH = os.getenv("GCS_CSV_PATH", "raw/csv/")
+
+# Shared bucket handle, created only when reading from GCS
+BUCKET = storage.Client().bucket(GCS_BUCKET) if USE_GCS else None
+
+# Number of files loaded concurrently, each on its own pooled connection
+MAX_CONCURRENCY = int(os.getenv("MAX_CONCURRENCY", "4"))
+
+# Bytes of CSV parsed per batch, about 100 000 accidents, so per-batch overhead is paid a few times per file
+CSV_BLOCK_SIZE = 64 << 20
+
+# Size of the pigz pipe and its reader buffer, so decompressed CSV moves in few large syscalls
+PIPE_BUFFER_SIZE = 1 << 20
+
+# Source column types, so Arrow parses them straight into typed buffers instead of inferring
+# them per block (an all-empty block would otherwise be inferred as another type)
+CSV_COLUMN_TYPES = {
+    "id": pa.int32(),
+    "lat": pa.float32(),  # ~7 significant digits, about 1 cm at London's coordinates
+    "lon": pa.float32(),
+    **{
+        col: pa.string()
+        for col in ["location", "date", "severity", "borough", "casualties", "vehicles"]
+    }
+}
+
+# Columns of the staging table, in COPY order
+TABLE_COLUMNS = [
+    "accident_id", "lat", "lon", "location", "accident_date",
+    "severity", "borough", "casualties", "vehicles"
+]
+
+# Source CSV columns read for each table column; the rest (e.g. `$type`) are skipped by the parser
+SOURCE_COLUMNS = [
+    "id", "lat", "lon", "location", "date",
+    "severity", "borough", "casualties", "vehicles"
+]
+
+# Binary COPY framing: signature + flags + header extension length, and the end-of-data marker
+PGCOPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+PGCOPY_TRAILER = struct.pack(">h", -1)
+PGCOPY_FIELD_COUNT = struct.pack(">h", len(TABLE_COLUMNS))
+PGCOPY_NULL = struct.pack(">i", -1)
+
+# Binary COPY fields: 4-byte length followed by the big-endian value
+INT4_FIELD = np.dtype([("length", ">i4"), ("value", ">i4")])
+FLOAT4_FIELD = np.dtype([("length", ">i4"), ("value", ">f4")])
+INT8_FIELD = np.dtype([("length", ">i4"), ("value", ">i8")])
+JSONB_VERSION = b"\x01"
+
+# Microseconds between the Unix epoch and PostgreSQL's 2000-01-01 epoch
+POSTGRES_EPOCH_OFFSET_US = 946_684_800_000_000
+
+# `$type` key/value pairs in JSON or Python-repr quoting, together with their separating comma
+TYPE_KEY_PATTERN = re.compile(
+    r"""["']\$type["']\s*:\s*["'][^"']*["']\s*,\s*|,?\s*["']\$type["']\s*:\s*["'][^"']*["']"""
+)
+
+# Rewrites turning a single-quoted Python repr into JSON: None/True/False outside of the quoted
+# strings (which are matched whole so their contents are left alone), then the quotes themselves
+REPR_TOKEN_PATTERN = re.compile(r"('(?:[^'\\]|\\.)*')|\b(None|True|False)\b")
+REPR_QUOTES = str.maketrans({"'": '"'})
+REPR_KEYWORDS = {"None": "null", "True": "true", "False": "false"}
+
 # Logging configuration
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
 # Ensure local directory exists
 os.makedirs(LOCAL_STORAGE, exist_ok=True)
 
-def connect_db():
-    """Establish a connection to PostgreSQL."""
+def create_pool():
+    """Establish a thread-safe pool of PostgreSQL connections, one per concurrent loader."""
     try:
-        conn = psycopg2.connect(**DB_PARAMS)
+        pool = psycopg2.pool.ThreadedConnectionPool(1, MAX_CONCURRENCY, **DB_PARAMS)
         logging.info(f"✅ Connected to PostgreSQL {'(Cloud)' if USE_CLOUD_DB else '(Local)'}")
-        return conn
+        return pool
     except Exception as e:
         logging.error(f"❌ Database connection failed: {e}")
         return None
 
-def recreate_table(table_name="public.stg_tfl_accidents"):
-    """Drop and recreate the PostgreSQL table to ensure the correct schema."""
-    conn = connect_db()
-    if not conn:
-        return
+@contextmanager
+def get_connection(pool):
+    """Borrow a connection from the pool, returning it once done."""
+    conn = pool.getconn()
+    try:
+        yield conn
+    finally:
+        pool.putconn(conn)
 
+def recreate_table(conn, table_name="public.stg_tfl_accidents"):
+    """Drop and recreate the PostgreSQL table to ensure the correct schema."""
     try:
         drop_table_sql = f"DROP TABLE IF EXISTS {table_name};"
         create_table_sql = f"""
-            CREATE TABLE {table_name} (
-                accident_id INTEGER PRIMARY KEY,
-                lat FLOAT,
-                lon FLOAT,
+            CREATE UNLOGGED TABLE {table_name} ( -- Truncate-and-reload staging, so WAL is skipped
+                accident_id INTEGER, -- PRIMARY KEY is added once loaded, see finalize_table
+                lat REAL,
+                lon REAL,
                 location TEXT,
                 accident_date TIMESTAMP,
                 severity TEXT,
                 borough TEXT,
                 casualties JSONB, -- Stored as structured JSON
-                vehicles JSONB -- Stored as structured JSON
+                vehicles JSONB, -- Stored as structured JSON
+                year INTEGER GENERATED ALWAYS AS (EXTRACT(year FROM accident_date)::int) STORED -- Derived server-side
             );
         """
         cur = conn.cursor()
@@ -73,124 +170,374 @@ def recreate_table(table_name="public.stg_tfl_accidents"):
         logging.info(f"✅ Table `{table_name}` recreated successfully.")
     except Exception as e:
         logging.error(f"❌ Error creating table `{table_name}`: {e}")
-    finally:
-        conn.close()
+        conn.rollback()
+
+def finalize_table(conn, table_name="public.stg_tfl_accidents"):
+    """Drop duplicate accidents, then add the PRIMARY KEY in a single index build."""
+    try:
+        cur = conn.cursor()
+        cur.execute(LOAD_SESSION_SQL)
+        cur.execute("SET LOCAL maintenance_work_mem = '1GB';")
+        # Overlapping files can repeat an accident; keep one arbitrary copy of each
+        cur.execute(f"""
+            DELETE FROM {table_name} a USING {table_name} b
+            WHERE a.accident_id = b.accident_id AND a.ctid > b.ctid;
+        """)
+        if cur.rowcount:
+            logging.warning(f"⚠️ Removed {cur.rowcount} duplicate accidents from `{table_name}`.")
+        cur.execute(f"ALTER TABLE {table_name} ADD PRIMARY KEY (accident_id);")
+        if DURABLE_STAGING:
+            cur.execute(f"ALTER TABLE {table_name} SET LOGGED;")
+        conn.commit()
+        cur.close()
+        logging.info(f"✅ Table `{table_name}` finalized with PRIMARY KEY.")
+    except Exception as e:
+        logging.error(f"❌ Error finalizing table `{table_name}`: {e}")
+        conn.rollback()
+
+def repr_keyword_to_json(match):
+    """Replace a matched Python keyword with its JSON literal, keeping quoted strings as they are."""
+    return match.group(1) or REPR_KEYWORDS[match.group(2)]
+
+def parse_json_field(field):
+    """Parse a nested JSON field, accepting the Python reprs written by older ingests."""
+    try:
+        return orjson.loads(field)  # Current ingest writes nested fields as JSON
+    except orjson.JSONDecodeError:
+        pass
+    if '"' in field or "\\'" in field:
+        return ast.literal_eval(field)  # Reprs mixing quotes, e.g. "St John's Wood", can't be rewritten
+    try:
+        # Single-quoted reprs differ from JSON only by their quotes and None/True/False
+        return orjson.loads(REPR_TOKEN_PATTERN.sub(repr_keyword_to_json, field).translate(REPR_QUOTES))
+    except orjson.JSONDecodeError:
+        return ast.literal_eval(field)
+
+def is_valid_json(text):
+    """Check whether a string (or UTF-8 bytes) parses as JSON."""
+    try:
+        orjson.loads(text)
+        return True
+    except orjson.JSONDecodeError:
+        return False
 
 def sanitize_json_field(field):
     """Sanitize and clean JSON-like fields, removing unnecessary keys."""
-    if pd.isna(field) or field.strip() == "":
+    # Cheap checks first, so missing and non-JSON values never reach the parser's exception path
+    if field is None or (isinstance(field, float) and field != field):
+        return None
+    if field[:1].isspace():
+        field = field.strip()
+    if not field or field[0] not in "[{'":
         return None
     try:
-        parsed = ast.literal_eval(field)  # Convert to Python object
+        parsed = parse_json_field(field)
         if isinstance(parsed, list):
-            cleaned_data = [{k: v for k, v in item.items() if k != "$type"} for item in parsed]
-            return json.dumps(cleaned_data)
-        return json.dumps(parsed)
+            cleaned_data = [
+                {k: v for k, v in item.items() if k != "$type"} if isinstance(item, dict) else item
+                for item in parsed
+            ]
+            return orjson.dumps(cleaned_data).decode()
+        return orjson.dumps(parsed).decode()
     except (ValueError, SyntaxError):
         logging.warning(f"⚠️ Could not parse JSON field: {field}")
         return None   
 
+def normalize_json_column(col):
+    """Strip `$type` keys and convert Python reprs to JSON across a whole column at once.
+
+    Values the vectorized pass can't safely rewrite fall back to `sanitize_json_field`.
+    """
+    is_repr = col.str.startswith("[{'", na=False)
+    # Reprs holding double-quoted strings or escaped apostrophes can't be rewritten by swapping quotes
+    needs_parser = is_repr & col.str.contains(r"\"|\\'", regex=True, na=False)
+
+    stripped = col.str.replace(TYPE_KEY_PATTERN.pattern, "", regex=True)
+    normalized = stripped.where(
+        ~is_repr,
+        stripped.str.replace(REPR_TOKEN_PATTERN, repr_keyword_to_json, regex=True).str.translate(REPR_QUOTES)
+    )
+
+    fast = ~needs_parser & normalized.str.startswith("[", na=False) & normalized.str.endswith("]", na=False)
+    # Bracketed values may still not be JSON (reprs not starting with `[{'`, `\x0b` escapes, inf/nan);
+    # one bad cell must not fail the COPY
+    if fast.any():
+        fast[fast] = normalized[fast].map(is_valid_json).astype(bool)
+    slow = col.notna() & ~fast
+
+    normalized = normalized.where(fast, None)
+    if slow.any():
+        normalized.loc[slow] = col[slow].apply(sanitize_json_field)
+    return normalized
+
+def normalize_json_array(array):
+    """Strip `$type` keys from a JSON column in Arrow, handing it to pandas only if it needs rewriting.
+
+    Columns written by the current ingest stay in Arrow once every value is checked to parse as JSON;
+    legacy reprs and malformed values go through `normalize_json_column`.
+    """
+    stripped = pc.replace_substring_regex(array, TYPE_KEY_PATTERN.pattern, "")
+    is_list = pc.and_(pc.starts_with(stripped, "["), pc.ends_with(stripped, "]"))
+    if pc.all(pc.or_kleene(is_list, pc.is_null(array))).as_py() and all(
+        is_valid_json(value) for value in stripped.cast(pa.binary()).drop_null().to_pylist()
+    ):
+        return stripped
+    return pa.array(normalize_json_column(array.to_pandas()), type=pa.string(), from_pandas=True)
+
 def get_local_files():
     """List all GZipped CSV files in the LOCAL_STORAGE directory."""
     local_files = [f for f in os.listdir(LOCAL_STORAGE) if f.endswith(".csv.gz")]
     logging.info(f"📂 Found {len(local_files)} compressed CSV files in `{LOCAL_STORAGE}`.")
     return local_files
 
-def extract_gz_file(gz_file_path):
-    """Extract a GZipped CSV file."""
-    local_csv_path = gz_file_path.replace(".gz", "")
+def get_gcs_files():
+    """List all GZipped CSV objects under GCS_CSV_PATH in the GCS bucket."""
+    blobs = BUCKET.list_blobs(prefix=GCS_CSV_PATH)
+    gcs_files = [blob.name for blob in blobs if blob.name.endswith(".csv.gz")]
+    logging.info(f"☁️ Found {len(gcs_files)} compressed CSV files in `gs://{GCS_BUCKET}/{GCS_CSV_PATH}`.")
+    return gcs_files
 
-    try:
-        with gzip.open(gz_file_path, "rb") as f_in, open(local_csv_path, "wb") as f_out:
-            shutil.copyfileobj(f_in, f_out)
-        os.remove(gz_file_path)  # Remove compressed file after extraction
-        logging.info(f"✅ Extracted `{local_csv_path}`.")
-        return local_csv_path
-    except Exception as e:
-        logging.error(f"❌ Failed to extract `{gz_file_path}`: {e}")
-        return None
+@contextmanager
+def open_gcs_gzip_stream(blob_name):
+    """Open a GZipped GCS object as a decompressed stream, without writing it to disk."""
+    blob = BUCKET.blob(blob_name)
+    with blob.open("rb") as raw, gzip.open(raw, "rb") as stream:
+        yield stream
 
-def clean_and_transform_data(df):
-    """Transform data to match PostgreSQL schema."""
-    if "$type" in df.columns:
-        df.drop(columns=["$type"], inplace=True)
+def clean_and_transform_data(batch):
+    """Transform an Arrow batch of source rows into a batch matching the PostgreSQL schema."""
+    # The reader already yields SOURCE_COLUMNS in table order, so renaming is all that's left
+    table = batch.rename_columns(TABLE_COLUMNS)
+    # Accidents without an id can't satisfy the PRIMARY KEY; dropping them keeps `accident_id` int32
+    table = table.filter(pc.is_valid(table.column("accident_id")))
+    for col in ["casualties", "vehicles"]:
+        index = table.schema.get_field_index(col)
+        table = table.set_column(index, col, normalize_json_array(table.column(index)))
 
-    rename_mapping = {
-        "id": "accident_id",
-        "date": "accident_date"
-    }
-    df.rename(columns=rename_mapping, inplace=True)
+    # Only dates go through pandas, for its ISO 8601 parser; normalised to naive UTC for the TIMESTAMP column
+    index = table.schema.get_field_index("accident_date")
+    dates = pd.to_datetime(
+        table.column(index).to_pandas(), errors="coerce", format="ISO8601", utc=True, cache=True
+    ).dt.tz_localize(None)
+    return table.set_column(
+        index, "accident_date", pa.Array.from_pandas(dates).cast(pa.timestamp("us"), safe=False)
+    )
+
+def encode_fixed_width_column(values, present, field_dtype):
+    """Pack a fixed-width column into binary COPY fields in one NumPy pass, then mark NULLs."""
+    packed = np.empty(len(values), dtype=field_dtype)
+    packed["length"] = field_dtype["value"].itemsize
+    packed["value"] = values
+    # Viewing each record as raw bytes lets NumPy hand back every field without per-cell packing
+    fields = packed.view(f"V{field_dtype.itemsize}").tolist()
+    for i in np.flatnonzero(~present):
+        fields[i] = PGCOPY_NULL
+    return fields
+
+def encode_int4_column(array):
+    """Encode a column as binary COPY INTEGER fields."""
+    values = pc.fill_null(array.cast(pa.int32()), 0).to_numpy()
+    return encode_fixed_width_column(values, pc.is_valid(array).to_numpy(zero_copy_only=False), INT4_FIELD)
+
+def encode_float4_column(array):
+    """Encode a column as binary COPY REAL fields."""
+    values = pc.fill_null(array.cast(pa.float32()), 0).to_numpy()
+    return encode_fixed_width_column(values, pc.is_valid(array).to_numpy(zero_copy_only=False), FLOAT4_FIELD)
+
+def encode_timestamp_column(array):
+    """Encode a naive UTC timestamp column as binary COPY TIMESTAMP fields (microseconds since 2000)."""
+    micros = pc.fill_null(array.cast(pa.timestamp("us")).cast(pa.int64()), POSTGRES_EPOCH_OFFSET_US).to_numpy()
+    values = micros - POSTGRES_EPOCH_OFFSET_US
+    return encode_fixed_width_column(values, pc.is_valid(array).to_numpy(zero_copy_only=False), INT8_FIELD)
+
+def encode_variable_width_column(array, prefix=b""):
+    """Frame a string column as binary COPY fields with Arrow kernels.
+
+    Values are never decoded to Python strings; only the finished fields become Python bytes.
+    """
+    data = array.cast(pa.binary())
+    if prefix:
+        data = pc.binary_join_element_wise(pa.scalar(prefix), data, b"")
+    lengths = pc.fill_null(pc.binary_length(data), 0).to_numpy().astype(">i4")
+    headers = pa.FixedSizeBinaryArray.from_buffers(
+        pa.binary(4), len(lengths), [None, pa.py_buffer(lengths.tobytes())]
+    ).cast(pa.binary())
+    fields = pc.binary_join_element_wise(headers, data, b"")
+    return pc.fill_null(fields, pa.scalar(PGCOPY_NULL, pa.binary())).to_pylist()
+
+def encode_text_column(array):
+    """Encode a column as binary COPY TEXT fields."""
+    return encode_variable_width_column(array)
+
+def encode_jsonb_column(array):
+    """Encode a JSON text column as binary COPY JSONB fields (version byte + JSON text)."""
+    return encode_variable_width_column(array, JSONB_VERSION)
+
+# Binary encoder for each staging table column
+COLUMN_ENCODERS = {
+    "accident_id": encode_int4_column,
+    "lat": encode_float4_column,
+    "lon": encode_float4_column,
+    "location": encode_text_column,
+    "accident_date": encode_timestamp_column,
+    "severity": encode_text_column,
+    "borough": encode_text_column,
+    "casualties": encode_jsonb_column,
+    "vehicles": encode_jsonb_column
+}
+
+def encode_binary_rows(batch, buf):
+    """Encode a cleaned Arrow batch as binary COPY tuples, so the server skips text parsing.
 
-    expected_columns = [
-        "accident_id", "lat", "lon", "location", "accident_date",
-        "severity", "borough", "casualties", "vehicles"
-    ]
-    df = df[[col for col in expected_columns if col in df.columns]]
+    Returns a view of `buf`, which is overwritten in place so its allocation is reused across batches.
+    """
+    columns = [COLUMN_ENCODERS[col](batch.column(col)) for col in TABLE_COLUMNS]
+    buf.seek(0)
+    buf.writelines(PGCOPY_FIELD_COUNT + b"".join(fields) for fields in zip(*columns))
+    buf.truncate()
+    return buf.getbuffer()
 
-    df["accident_id"] = pd.to_numeric(df["accident_id"], errors="coerce").dropna().astype(int)
-    df["accident_date"] = pd.to_datetime(df["accident_date"], errors="coerce")
+class IteratorStream(io.RawIOBase):
+    """Read-only file object over an iterator of byte strings, consumed lazily by COPY.
 
-    for json_col in ["casualties", "vehicles"]:
-        if json_col in df.columns:
-            df[json_col] = df[json_col].apply(sanitize_json_field)
+    Each chunk is fully read before the next is requested, so the iterator may reuse its buffer.
+    """
 
-    return df
+    def __init__(self, iterator):
+        self._iterator = iterator
+        self._buffer = memoryview(b"")
 
-def load_csv_in_batches(file_path, table_name="public.stg_tfl_accidents", batch_size=10000):
-    """Load CSV file into PostgreSQL in batches."""
-    conn = connect_db()
-    if not conn:
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        while not self._buffer:
+            self._buffer.release()  # Let the producer overwrite its buffer for the next chunk
+            try:
+                self._buffer = memoryview(next(self._iterator))
+            except StopIteration:
+                return 0
+        size = min(len(b), len(self._buffer))
+        b[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+@contextmanager
+def open_csv_reader(file_path, block_size=CSV_BLOCK_SIZE):
+    """Open a streaming Arrow reader over a GZipped CSV file, local or in GCS."""
+    options = {
+        "read_options": pacsv.ReadOptions(block_size=block_size),
+        # Only table columns are converted; any missing from a file are read as typed NULLs
+        "convert_options": pacsv.ConvertOptions(
+            column_types=CSV_COLUMN_TYPES,
+            strings_can_be_null=True,
+            include_columns=SOURCE_COLUMNS,
+            include_missing_columns=True
+        )
+    }
+
+    if USE_GCS:
+        with open_gcs_gzip_stream(file_path) as stream:
+            yield pacsv.open_csv(stream, **options)
         return
 
+    pigz = shutil.which("pigz")
+    if pigz is None and HAS_ISAL:
+        with gzip.open(file_path, "rb") as stream:
+            yield pacsv.open_csv(stream, **options)
+        return
+    if pigz is None:
+        # Arrow's multithreaded parser decompresses `.gz` input and yields one batch per block
+        yield pacsv.open_csv(file_path, **options)
+        return
+
+    # pigz decompresses in its own process, overlapping with Arrow's parsing
+    proc = subprocess.Popen([pigz, "-dc", file_path], stdout=subprocess.PIPE, bufsize=PIPE_BUFFER_SIZE)
+    try:
+        # Linux pipes default to 64 KiB; a larger one means fewer wakeups between pigz and the parser
+        import fcntl
+        fcntl.fcntl(proc.stdout.fileno(), fcntl.F_SETPIPE_SZ, PIPE_BUFFER_SIZE)
+    except (ImportError, AttributeError, OSError):
+        pass  # Not Linux, or above /proc/sys/fs/pipe-max-size
     try:
-        chunk_iterator = pd.read_csv(file_path, chunksize=batch_size)
+        yield pacsv.open_csv(proc.stdout, **options)
+    finally:
+        proc.stdout.close()
+        returncode = proc.wait()
+    if returncode != 0:
+        raise RuntimeError(f"pigz exited with status {returncode} while decompressing `{file_path}`")
 
-        total_rows = 0
-        for chunk in chunk_iterator:
-            logging.debug(f"Columns in DataFrame: {chunk.columns.tolist()}")
-            chunk = clean_and_transform_data(chunk)
+def load_csv_in_batches(file_path, conn, table_name="public.stg_tfl_accidents", block_size=CSV_BLOCK_SIZE):
+    """Load a GZipped CSV file into PostgreSQL in batches, decompressing it on the fly.
 
-            csv_buffer = StringIO()
-            chunk.to_csv(csv_buffer, index=False, header=False, sep='\t')
-            csv_buffer.seek(0)
+    Returns True if the file was loaded, False if the COPY failed and the whole file was rolled back.
+    """
+    copy_sql = f"""
+        COPY {table_name} ({", ".join(TABLE_COLUMNS)})
+        FROM STDIN WITH (FORMAT BINARY);
+    """
 
-            copy_sql = f"""
-                COPY {table_name} (accident_id, lat, lon, location, accident_date, severity, borough, casualties, vehicles)
-                FROM STDIN WITH CSV DELIMITER E'\t' NULL 'NULL' QUOTE '"';
-            """
-            cur = conn.cursor()
-            cur.copy_expert(copy_sql, csv_buffer)
-            conn.commit()
+    try:
+        total_rows = 0
 
-            total_rows += len(chunk)
-            logging.info(f"✅ Uploaded {len(chunk)} rows, Total: {total_rows}")
+        def copy_chunks(reader):
+            nonlocal total_rows
+            yield PGCOPY_HEADER
+            buf = io.BytesIO()
+            for batch in reader:
+                chunk = clean_and_transform_data(batch)
+                total_rows += len(chunk)
+                logging.info(f"✅ Streamed {len(chunk)} rows, Total: {total_rows}")
+                yield encode_binary_rows(chunk, buf)
+            yield PGCOPY_TRAILER
 
-        cur.close()
+        # Every chunk of the file goes through a single COPY on one cursor, in one transaction
+        with conn.cursor() as cur, open_csv_reader(file_path, block_size) as reader:
+            cur.execute(LOAD_SESSION_SQL)
+            cur.copy_expert(copy_sql, IteratorStream(copy_chunks(reader)), size=1 << 20)
+        conn.commit()
         logging.info(f"🎯 Finished loading `{file_path}`: {total_rows} rows uploaded.")
+        return True
     except Exception as e:
         logging.error(f"❌ Error loading `{file_path}`: {e}")
         conn.rollback()
-    finally:
-        conn.close()
+        return False
 
-def process_pipeline():
-    """End-to-end pipeline: recreate table, process local CSV files, and load them into PostgreSQL."""
-    recreate_table()
+def load_file(file_path, pool):
+    """Load one GZipped CSV file on a pooled connection."""
+    with get_connection(pool) as conn:
+        logging.info(f"📄 Processing `{file_path}`...")
+        loaded = load_csv_in_batches(file_path, conn)
+    if loaded and not USE_GCS:
+        os.remove(file_path) # Remove compressed file after loading, keeping failed ones for a rerun
 
-    local_files = get_local_files()
-    if not local_files:
-        logging.warning("⚠️ No GZipped CSV files found in LOCAL_STORAGE.")
+def process_pipeline():
+    """End-to-end pipeline: recreate table, process local or GCS CSV files, and load them into PostgreSQL."""
+    # Connections are set up once and reused across all files
+    pool = create_pool()
+    if not pool:
         return
 
-    for local_file in local_files:
-        local_gz_path = os.path.join(LOCAL_STORAGE, local_file)
-        local_csv_path = extract_gz_file(local_gz_path)
-        if not local_csv_path:
-            continue
+    try:
+        with get_connection(pool) as conn:
+            recreate_table(conn)
+
+        if USE_GCS:
+            files = get_gcs_files()
+        else:
+            files = [os.path.join(LOCAL_STORAGE, local_file) for local_file in get_local_files()]
+        if not files:
+            logging.warning(f"⚠️ No GZipped CSV files found in {'GCS' if USE_GCS else 'LOCAL_STORAGE'}.")
+            return
 
-        logging.info(f"📄 Processing `{local_csv_path}`...")
-        load_csv_in_batches(local_csv_path)
-        os.remove(local_csv_path) # Remove CSV file after loading
+        # Downloads, decompression and parsing of one file overlap with COPYs of the others
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENCY) as executor:
+            list(executor.map(partial(load_file, pool=pool), files))
+
+        with get_connection(pool) as conn:
+            finalize_table(conn)
+    finally:
+        pool.closeall()
 
 if __name__ == "__main__":
     logging.info("🚀 Starting CSV ingestion pipeline...")